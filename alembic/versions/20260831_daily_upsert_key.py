@@ -0,0 +1,47 @@
+"""Make (device_id, date) the canonical daily key
+
+Revision ID: 20260831_daily_upsert_key
+Revises: 20260831_stat_columns
+Create Date: 2026-08-31
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20260831_daily_upsert_key"
+down_revision: Union[str, None] = "20260831_stat_columns"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Collapse duplicates left over from the insert-only period: keep the
+    # newest (collected_at, id) row per (device_id, date).
+    op.execute("""
+        DELETE FROM health_connect_daily a
+        USING health_connect_daily b
+        WHERE a.device_id = b.device_id
+          AND a.date = b.date
+          AND (a.collected_at, a.id) < (b.collected_at, b.id)
+    """)
+    # The (device_id, date, payload_hash) dedup index is subsumed by the
+    # stricter unique key on daily; intraday keeps its dedup index.
+    op.drop_index("ix_hcd_dedup", table_name="health_connect_daily")
+    op.create_index(
+        "ux_hcd_device_date",
+        "health_connect_daily",
+        ["device_id", "date"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_hcd_device_date", table_name="health_connect_daily")
+    op.create_index(
+        "ix_hcd_dedup",
+        "health_connect_daily",
+        ["device_id", "date", "payload_hash"],
+        unique=True,
+    )
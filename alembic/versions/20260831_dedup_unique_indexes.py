@@ -0,0 +1,36 @@
+"""Add unique dedup indexes on (device_id, date, payload_hash)
+
+Revision ID: 20260831_dedup_indexes
+Revises: 20260301_payload_hash_record_type
+Create Date: 2026-08-31
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20260831_dedup_indexes"
+down_revision: Union[str, None] = "20260301_payload_hash_record_type"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_hcd_dedup",
+        "health_connect_daily",
+        ["device_id", "date", "payload_hash"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_hcil_dedup",
+        "health_connect_intraday_logs",
+        ["device_id", "date", "payload_hash"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_hcil_dedup", table_name="health_connect_intraday_logs")
+    op.drop_index("ix_hcd_dedup", table_name="health_connect_daily")
@@ -0,0 +1,31 @@
+"""Drop the legacy shealth_daily table
+
+Revision ID: 20260831_drop_shealth
+Revises: 20260831_raw_json_gin
+Create Date: 2026-08-31
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20260831_drop_shealth"
+down_revision: Union[str, None] = "20260831_raw_json_gin"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # shealth_daily predates the v3 raw-payload schema; its data was
+    # backfilled into health_connect_daily and no code path has read or
+    # written it since the ShealthDaily model was removed. IF EXISTS
+    # because fresh databases never had it (create_all only knows the
+    # v3 models).
+    op.execute("DROP TABLE IF EXISTS shealth_daily")
+
+
+def downgrade() -> None:
+    # The pre-v3 table definition lived only in the old model code and
+    # its data is gone with the drop — restore from a backup instead.
+    raise RuntimeError("shealth_daily cannot be recreated by migration; restore from backup")
@@ -0,0 +1,41 @@
+"""Index the latest-record and /v1/logs ordering scans
+
+Revision ID: 20260831_latest_indexes
+Revises: 20260831_dedup_indexes
+Create Date: 2026-08-31
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260831_latest_indexes"
+down_revision: Union[str, None] = "20260831_dedup_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Turns get_latest_record into Limit -> Index Scan using ix_hcd_latest
+    # with a single heap probe. raw_json is deliberately not INCLUDEd —
+    # it would bloat the index past TOAST-inline size.
+    op.create_index(
+        "ix_hcd_latest",
+        "health_connect_daily",
+        [sa.text("date DESC"), sa.text("collected_at DESC")],
+        postgresql_include=["device_id", "received_at", "schema_version", "source_app"],
+    )
+    op.create_index(
+        "ix_hcil_collected_at",
+        "health_connect_intraday_logs",
+        [sa.text("collected_at DESC")],
+    )
+    op.execute("ANALYZE health_connect_daily")
+    op.execute("ANALYZE health_connect_intraday_logs")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_hcil_collected_at", table_name="health_connect_intraday_logs")
+    op.drop_index("ix_hcd_latest", table_name="health_connect_daily")
@@ -0,0 +1,31 @@
+"""Composite index for filtered /v1/logs queries
+
+Revision ID: 20260831_logs_filter_index
+Revises: 20260831_daily_upsert_key
+Create Date: 2026-08-31
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260831_logs_filter_index"
+down_revision: Union[str, None] = "20260831_daily_upsert_key"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # /v1/logs filters on device_id and/or date, then orders collected_at
+    # DESC LIMIT n; this turns that into an index range scan + limit.
+    op.create_index(
+        "ix_hcil_device_date_collected",
+        "health_connect_intraday_logs",
+        ["device_id", "date", sa.text("collected_at DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_hcil_device_date_collected", table_name="health_connect_intraday_logs")
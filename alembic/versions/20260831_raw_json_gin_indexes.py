@@ -0,0 +1,38 @@
+"""GIN jsonb_path_ops indexes on raw_json
+
+Revision ID: 20260831_raw_json_gin
+Revises: 20260831_logs_filter_index
+Create Date: 2026-08-31
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20260831_raw_json_gin"
+down_revision: Union[str, None] = "20260831_logs_filter_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # jsonb_path_ops rather than the default jsonb_ops: only answers @>
+    # containment, but the index is a fraction of the size. Queries must
+    # use top-level @> form to hit it. CONCURRENTLY so ingest keeps
+    # flowing while the (large) raw_json blobs are indexed.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_hcd_raw_json_gin "
+            "ON health_connect_daily USING gin (raw_json jsonb_path_ops)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_hcil_raw_json_gin "
+            "ON health_connect_intraday_logs USING gin (raw_json jsonb_path_ops)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_hcil_raw_json_gin")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_hcd_raw_json_gin")
